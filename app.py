@@ -5,7 +5,17 @@ A Streamlit application for common lab calculations and protocol design.
 
 import streamlit as st
 import json
+import os
+import sqlite3
+import numpy as np
 from pathlib import Path
+from contextlib import closing
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from calculations import (
     calculate_mass,
     calculate_molarity,
@@ -15,14 +25,16 @@ from calculations import (
     calculate_percent_solution,
     calculate_stock_molarity,
     scale_recipe,
-    MassUnit,
-    VolumeUnit,
-    ConcentrationUnit,
+    ProtocolSteps,
     format_mass,
     format_volume,
     format_concentration,
+    best_volume_unit,
+    MASS_TO_GRAMS,
+    VOLUME_TO_LITERS,
+    CONC_TO_MOLAR,
 )
-from pdf_generator import create_protocol_pdf, create_plate_pdf
+# pdf_generator (fpdf) and pandas are imported lazily at their use sites to keep cold start fast
 
 # --- Common Recipes Data ---
 COMMON_RECIPES = {
@@ -48,6 +60,21 @@ COMMON_RECIPES = {
     ]
 }
 
+
+def _recipe_columns(recipe_steps):
+    """Split recipe steps into parallel reagent/unit/amount_per_L columns (read-only)."""
+    amounts_per_L = np.array([item["amount_per_L"] for item in recipe_steps], dtype=np.float64)
+    amounts_per_L.flags.writeable = False
+    return {
+        "reagents": tuple(item["reagent"] for item in recipe_steps),
+        "units": tuple(item["unit"] for item in recipe_steps),
+        "amounts_per_L": amounts_per_L,
+    }
+
+
+# Columnar form of COMMON_RECIPES, built once at import and shared by every session
+_COMMON_RECIPES_SOA = {name: _recipe_columns(steps) for name, steps in COMMON_RECIPES.items()}
+
 # --- Common Concentrates Data ---
 COMMON_CONCENTRATES = {
     "Hydrochloric Acid (37%)": {"mw": 36.46, "density": 1.19, "purity": 37.0},
@@ -62,6 +89,43 @@ COMMON_CONCENTRATES = {
     "Sodium Hydroxide (50% w/w)": {"mw": 40.00, "density": 1.525, "purity": 50.0},
 }
 
+# --- Unit Converter Factors ---
+# Mass/volume concentrations to the base unit g/L
+# (mg/dL = 0.01 g/L: 1 mg / 100 mL = 0.001 g / 0.1 L)
+MASS_VOLUME_TO_G_PER_L = {
+    "g/mL": 1000.0,
+    "g/L": 1.0,
+    "mg/mL": 1.0,
+    "µg/mL": 0.001,
+    "mg/dL": 0.01
+}
+
+# Output columns of each converter tab: (labels, multipliers from the tab's base unit)
+_MASS_OUTPUTS = (("kg", "g", "mg", "µg"), np.array([1e-3, 1.0, 1e3, 1e6]))
+_VOLUME_OUTPUTS = (("L", "mL", "µL"), np.array([1.0, 1e3, 1e6]))
+_CONC_OUTPUTS = (("M", "mM", "µM", "nM"), np.array([1.0, 1e3, 1e6, 1e9]))
+_MASS_VOLUME_OUTPUTS = (("g/mL", "g/L (mg/mL)", "µg/mL", "mg/dL"), np.array([1e-3, 1.0, 1e3, 100.0]))
+
+# Rounds to 4 significant figures (as a string) for readable amounts
+_FMT_4G = "{:.4g}".format
+
+# --- HTML Templates ---
+_CARD_TMPL = (
+    '<div class="result-card">'
+    '<div class="result-value">{value}</div>'
+    '<div class="result-label">{label}</div>'
+    '</div>'
+).format
+
+_QUICK_REF_MD = (
+    "### Quick Reference\n"
+    "**Common Formulas:**\n"
+    "- `Mass = M × V × MW`\n"
+    "- `C₁V₁ = C₂V₂`\n"
+    "- `% w/v = (g/mL) × 100`\n"
+)
+_SIDEBAR_FOOTER_HTML = "<p style='color: #64748b; font-size: 0.8rem;'>Laboratory Assistant v1.0</p>"
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Lab Assistant",
@@ -71,193 +135,256 @@ st.set_page_config(
 )
 
 # --- Custom CSS for Premium Look ---
-st.markdown("""
-<style>
-    /* Main theme colors */
-    :root {
-        --primary: #6366f1;
-        --primary-dark: #4f46e5;
-        --accent: #22d3ee;
-        --success: #10b981;
-        --warning: #f59e0b;
-        --danger: #ef4444;
-        --bg-dark: #0f172a;
-        --bg-card: #1e293b;
-        --text: #f8fafc;
-        --text-muted: #94a3b8;
-    }
-    
-    /* Global styles */
-    .stApp {
-        background-color: var(--bg-dark);
-        color: var(--text);
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1e293b 0%, #0f172a 100%);
-    }
-    
-    /* Sidebar Text Fix - Force light text */
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] p,
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h1,
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h2,
-    [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] h3,
-    [data-testid="stSidebar"] [data-testid="stRadio"] label,
-    [data-testid="stSidebar"] .stRadio p {
-        color: #f8fafc !important;
-    }
-    
-    /* Fix radio button unselected option text color if needed */
-    [data-testid="stSidebar"] .stRadio div[role="radiogroup"] label p {
-        color: #f8fafc !important;
-    }
-    
-    /* Result display cards */
-    .result-card {
-        background: linear-gradient(135deg, #1e293b 0%, #334155 100%);
-        border-radius: 16px;
-        padding: 24px;
-        margin: 16px 0;
-        border: 1px solid rgba(99, 102, 241, 0.3);
-        box-shadow: 0 4px 24px rgba(0, 0, 0, 0.2);
-    }
-    
-    .result-value {
-        font-size: 3rem;
-        font-weight: 700;
-        background: linear-gradient(90deg, #6366f1, #22d3ee);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-align: center;
-    }
-    
-    .result-label {
-        font-size: 1rem;
-        color: #94a3b8;
-        text-align: center;
-        margin-top: 8px;
-    }
-    
-    /* Protocol step cards */
-    .step-card {
-        background: #1e293b;
-        border-radius: 12px;
-        padding: 16px;
-        margin: 8px 0;
-        border-left: 4px solid #6366f1;
-    }
-    
-    /* Hazard badges */
-    .hazard-none { background: #10b981; color: white; padding: 4px 12px; border-radius: 20px; font-size: 0.8rem; }
-    .hazard-irritant { background: #f59e0b; color: black; padding: 4px 12px; border-radius: 20px; font-size: 0.8rem; }
-    .hazard-flammable { background: #ef4444; color: white; padding: 4px 12px; border-radius: 20px; font-size: 0.8rem; }
-    
-    /* Large metric display */
-    .big-metric {
-        font-size: 2.5rem;
-        font-weight: 600;
-        color: #22d3ee;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        border-radius: 8px;
-        padding: 12px 24px;
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(90deg, #6366f1, #4f46e5);
-        border: none;
-        border-radius: 8px;
-        padding: 12px 24px;
-        font-weight: 600;
-        transition: transform 0.2s, box-shadow 0.2s;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 16px rgba(99, 102, 241, 0.4);
-    }
-    
-    /* Info boxes */
-    .info-box {
-        background: rgba(34, 211, 238, 0.1);
-        border: 1px solid rgba(34, 211, 238, 0.3);
-        border-radius: 12px;
-        padding: 16px;
-        margin: 12px 0;
-    }
-    
-    /* Header styling */
-    h1 {
-        color: #6366f1;
-        font-weight: 800;
-        text-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _css():
+    """Read the app stylesheet once per process."""
+    return Path(__file__).parent.joinpath("styles.css").read_text(encoding="utf-8")
+
+
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+
+# --- JSON Helpers ---
+def _loads_json(raw):
+    """Parse JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps_json(data, pretty=False):
+    """JSON encoding as bytes (compact, or 2-space indented if pretty), using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    # ensure_ascii=False writes µ, ° etc. as UTF-8, like orjson does
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode()
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _read_json(path):
+    """Parse a JSON file, using orjson when it is installed."""
+    return _loads_json(path.read_bytes())
+
+
+def _write_json(path, data):
+    """
+    Write data to a JSON file, using orjson when it is installed.
+    The file is written to a temporary sibling and swapped in atomically.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(_dumps_json(data, pretty=True))
+    os.replace(tmp_path, path)
 
 
 # --- Load Reagents ---
-@st.cache_data
-def load_reagents():
-    """Load reagents from JSON file."""
-    reagents_path = Path(__file__).parent / "reagents.json"
+REAGENTS_PATH = Path(__file__).parent / "reagents.json"
+
+
+def build_reagent_index(reagents):
+    """
+    Build parallel lowercase search columns for the reagent filter.
+    
+    Returns: (names_lc, formulas_lc, categories, sorted_categories); the first
+             three are aligned with reagents, the last holds the unique categories
+    """
+    names_lc = [r["name"].lower() for r in reagents]
+    formulas_lc = [r.get("formula", "").lower() for r in reagents]
+    categories = [r.get("category", "Other") for r in reagents]
+    sorted_categories = tuple(sorted(set(categories)))
+    return names_lc, formulas_lc, categories, sorted_categories
+
+
+# Hazard labels with their own style in styles.css; any other hazard uses hazard-none
+_HAZARD_CSS = {
+    "None": "hazard-none",
+    "Irritant": "hazard-irritant",
+    "Flammable": "hazard-flammable",
+}
+
+
+def _css_class(hazard):
+    """CSS class for a hazard label."""
+    return _HAZARD_CSS.get(hazard, "hazard-none")
+
+
+def _index_reagents(reagents):
+    """Bundle the reagent list with name-keyed lookup tables and search columns."""
+    meta = {}
+    for r in reagents:
+        hazard = r.get("hazard", "None")
+        meta[r["name"]] = (hazard, r.get("storage", "N/A"), _css_class(hazard))
+    return {
+        "reagents": reagents,
+        "by_name": {r["name"]: r for r in reagents},
+        "meta": meta,
+        "names_lower": frozenset(r["name"].lower() for r in reagents),
+        "search_index": build_reagent_index(reagents),
+    }
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_reagents_cached(path_str, mtime_ns):
+    """Parse the reagents file. mtime_ns is only part of the cache key."""
+    data = _read_json(Path(path_str))
+    return _index_reagents(data.get("reagents", []))
+
+
+def _try_load_reagents():
+    """
+    Stat reagents.json and fetch its mtime-keyed cached index.
+    
+    Returns: the index dict, or None (after showing an error) if the file is missing
+    """
     try:
-        with open(reagents_path, "r") as f:
-            data = json.load(f)
-            return data.get("reagents", [])
+        return _load_reagents_cached(str(REAGENTS_PATH), REAGENTS_PATH.stat().st_mtime_ns)
     except FileNotFoundError:
         st.error("reagents.json not found!")
-        return []
+        return None
+
+
+def load_reagents():
+    """
+    Load reagents from JSON file, re-parsing only when it changes on disk.
+    
+    Returns: dict with "reagents" (list, file order), "by_name" (name -> reagent),
+             "meta" (name -> (hazard, storage, hazard_css_class)),
+             "names_lower" (set of lowercased names for duplicate checks)
+             and "search_index" (see build_reagent_index)
+    """
+    reagent_db = _try_load_reagents()
+    return reagent_db if reagent_db is not None else _index_reagents([])
+
+
+def _reagents():
+    """Per-session handle on load_reagents(), so repeat calls skip the cache lookup."""
+    if "_reagents" not in st.session_state:
+        reagent_db = _try_load_reagents()
+        if reagent_db is None:
+            # Not remembered, so the session picks the file up once it exists
+            return _index_reagents([])
+        st.session_state._reagents = reagent_db
+    return st.session_state._reagents
         
         
 def save_reagent(new_reagent):
     """Save a new reagent to the JSON file."""
-    reagents_path = Path(__file__).parent / "reagents.json"
     try:
-        # Load existing
-        with open(reagents_path, "r") as f:
-            data = json.load(f)
-        
         # Check for duplicates
-        if any(r["name"].lower() == new_reagent["name"].lower() for r in data["reagents"]):
+        new_lower = new_reagent["name"].lower()
+        if new_lower in load_reagents()["names_lower"]:
             return False, "Reagent with this name already exists!"
+        
+        # Load existing
+        data = _read_json(REAGENTS_PATH)
             
         # Append and save
         data["reagents"].append(new_reagent)
-        with open(reagents_path, "w") as f:
-            json.dump(data, f, indent=4)
+        _write_json(REAGENTS_PATH, data)
         
-        # Clear cache to force reload
-        load_reagents.clear()
+        # Drop this session's copy so the new reagent shows up
+        st.session_state.pop("_reagents", None)
         return True, "Reagent added successfully!"
         
     except Exception as e:
         return False, f"Error saving reagent: {str(e)}"
 
 # --- Load User Recipes ---
-def load_user_recipes():
-    """Load user recipes from JSON file."""
-    recipes_path = Path(__file__).parent / "saved_recipes.json"
+RECIPES_DB_PATH = Path(__file__).parent / "saved_recipes.db"
+LEGACY_RECIPES_PATH = Path(__file__).parent / "saved_recipes.json"
+
+
+def _legacy_recipe_rows():
+    """
+    Parse saved_recipes.json for the one-time import into the database.
+    Entries without a name or steps are skipped; an unreadable file imports nothing.
+    
+    Returns: list of (name, steps_json) rows
+    """
     try:
-        with open(recipes_path, "r") as f:
-            data = json.load(f)
-            return data.get("recipes", [])
-    except (FileNotFoundError, json.JSONDecodeError):
+        recipes = _read_json(LEGACY_RECIPES_PATH).get("recipes", {})
+        if isinstance(recipes, list):
+            # Legacy layout: [{"name": ..., "steps": [...]}, ...]
+            recipes = {
+                r["name"]: r["steps"] for r in recipes
+                if isinstance(r, dict) and "name" in r and "steps" in r
+            }
+        return [(name, _dumps_json(steps)) for name, steps in recipes.items()]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
         return []
 
-def save_user_recipe_to_file(name, steps, base_vol_L):
-    """Save a user recipe to the JSON file."""
-    recipes_path = Path(__file__).parent / "saved_recipes.json"
+
+def _connect_recipes_db():
+    """
+    Open the user recipes database, creating it on first use.
+    A new database is seeded from the legacy saved_recipes.json file.
+    
+    Returns: sqlite3.Connection (caller closes it)
+    """
+    is_new = not RECIPES_DB_PATH.exists()
+    # Parsed before the database is touched, so a bad file can't abort the import halfway
+    legacy_rows = _legacy_recipe_rows() if is_new and LEGACY_RECIPES_PATH.exists() else []
+    conn = sqlite3.connect(RECIPES_DB_PATH)
+    try:
+        with conn:
+            # Explicit BEGIN: sqlite3 would otherwise commit the CREATE on its own
+            conn.execute("BEGIN")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recipes (name TEXT PRIMARY KEY, steps_json BLOB NOT NULL)"
+            )
+            # OR IGNORE: never clobber a recipe another session saved meanwhile
+            conn.executemany(
+                "INSERT OR IGNORE INTO recipes (name, steps_json) VALUES (?, ?)",
+                legacy_rows
+            )
+    except BaseException:
+        conn.close()
+        if is_new:
+            # Leave no empty database behind, so the next call retries the import
+            RECIPES_DB_PATH.unlink(missing_ok=True)
+        raise
+    return conn
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _user_recipe_names_cached(path_str, mtime_ns):
+    """List saved recipe names, oldest save first. mtime_ns is only part of the cache key."""
+    with closing(sqlite3.connect(path_str)) as conn:
+        return [name for (name,) in conn.execute("SELECT name FROM recipes ORDER BY rowid")]
+
+
+def load_user_recipe_names():
+    """
+    List the user's saved recipes, re-querying only when the database changes on disk.
     
+    Returns: list of recipe names in save order
+    """
+    try:
+        if not RECIPES_DB_PATH.exists():
+            if not LEGACY_RECIPES_PATH.exists():
+                return []
+            _connect_recipes_db().close()  # Imports saved_recipes.json
+        return _user_recipe_names_cached(str(RECIPES_DB_PATH), RECIPES_DB_PATH.stat().st_mtime_ns)
+    except sqlite3.Error:
+        return []
+
+
+def load_user_recipe(name):
+    """
+    Fetch one saved recipe by name.
+    
+    Returns: list of normalized steps, or None if there is no such recipe
+    """
+    try:
+        with closing(_connect_recipes_db()) as conn:
+            row = conn.execute("SELECT steps_json FROM recipes WHERE name = ?", (name,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return _loads_json(row[0]) if row else None
+
+
+def save_user_recipe_to_file(name, steps, base_vol_L):
+    """Save a user recipe to the recipes database."""
     # Calculate amounts per L for storage (normalization)
     normalized_steps = []
     for step in steps:
@@ -267,20 +394,14 @@ def save_user_recipe_to_file(name, steps, base_vol_L):
             new_step["amount_per_L"] = step["amount"] / base_vol_L
             new_step.pop("amount", None) # Remove absolute amount
         normalized_steps.append(new_step)
-
-    new_recipe = {
-        "name": name,
-        "steps": normalized_steps
-    }
     
     try:
-        existing = load_user_recipes()
-        # Remove overwrite if exists
-        existing = [r for r in existing if r["name"] != name]
-        existing.append(new_recipe)
-        
-        with open(recipes_path, "w") as f:
-            json.dump({"recipes": existing}, f, indent=4)
+        with closing(_connect_recipes_db()) as conn, conn:
+            # REPLACE deletes and re-inserts, so an overwritten recipe moves to the end like a fresh save
+            conn.execute(
+                "INSERT OR REPLACE INTO recipes (name, steps_json) VALUES (?, ?)",
+                (name, _dumps_json(normalized_steps))
+            )
         return True, "Recipe saved successfully!"
     except Exception as e:
         return False, f"Error saving recipe: {str(e)}"
@@ -290,9 +411,8 @@ def load_plate_maps():
     """Load plate maps from JSON."""
     path = Path(__file__).parent / "plate_maps.json"
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-            return data.get("plate_maps", [])
+        data = _read_json(path)
+        return data.get("plate_maps", [])
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
@@ -311,40 +431,7 @@ def save_plate_map(name, plate_data):
         existing = [m for m in existing if m["name"] != name]
         existing.append(new_map)
         
-        with open(path, "w") as f:
-            json.dump({"plate_maps": existing}, f, indent=4)
-        return True, "Plate map saved!"
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
-# --- Load/Save Plate Maps ---
-def load_plate_maps():
-    """Load plate maps from JSON."""
-    path = Path(__file__).parent / "plate_maps.json"
-    try:
-        with open(path, "r") as f:
-            data = json.load(f)
-            return data.get("plate_maps", [])
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
-
-def save_plate_map(name, plate_data):
-    """Save a plate map."""
-    path = Path(__file__).parent / "plate_maps.json"
-    
-    new_map = {
-        "name": name,
-        "data": plate_data,
-        "updated": datetime.now().strftime("%Y-%m-%d %H:%M")
-    }
-    
-    try:
-        existing = load_plate_maps()
-        existing = [m for m in existing if m["name"] != name]
-        existing.append(new_map)
-        
-        with open(path, "w") as f:
-            json.dump({"plate_maps": existing}, f, indent=4)
+        _write_json(path, {"plate_maps": existing})
         return True, "Plate map saved!"
     except Exception as e:
         return False, f"Error: {str(e)}"
@@ -358,7 +445,7 @@ def save_plate_map(name, plate_data):
 def init_session_state():
     """Initialize session state variables."""
     if "protocol_steps" not in st.session_state:
-        st.session_state.protocol_steps = []
+        st.session_state.protocol_steps = ProtocolSteps()
     if "protocol_total_volume" not in st.session_state:
         st.session_state.protocol_total_volume = 100.0
     if "protocol_volume_unit" not in st.session_state:
@@ -390,19 +477,10 @@ def render_sidebar():
         )
         
         st.markdown("---")
-        st.markdown("### Quick Reference")
-        st.markdown("""
-        **Common Formulas:**
-        - `Mass = M × V × MW`
-        - `C₁V₁ = C₂V₂`
-        - `% w/v = (g/mL) × 100`
-        """)
+        st.markdown(_QUICK_REF_MD)
         
         st.markdown("---")
-        st.markdown(
-            "<p style='color: #64748b; font-size: 0.8rem;'>Laboratory Assistant v1.0</p>",
-            unsafe_allow_html=True
-        )
+        st.markdown(_SIDEBAR_FOOTER_HTML, unsafe_allow_html=True)
         
         return page
 
@@ -414,8 +492,9 @@ def render_calculators():
     
     tabs = st.tabs(["💊 Molarity Calculator", "🔬 Dilution Calculator", "📈 Serial Dilution", "📊 Percent Solution", "🧴 Bottle Molarity"])
     
-    reagents = load_reagents()
-    reagent_names = ["Custom"] + [r["name"] for r in reagents]
+    reagent_db = _reagents()
+    reagents_by_name = reagent_db["by_name"]
+    reagent_names = ["Custom"] + [r["name"] for r in reagent_db["reagents"]]
     
     # --- Molarity Calculator Tab ---
     with tabs[0]:
@@ -433,7 +512,7 @@ def render_calculators():
                 mw = st.number_input("Molecular Weight (g/mol)", min_value=0.01, value=100.0, step=0.01)
                 purity = st.number_input("Purity (%)", min_value=0.1, max_value=100.0, value=100.0, step=0.1)
             else:
-                reagent = next((r for r in reagents if r["name"] == selected_reagent), None)
+                reagent = reagents_by_name.get(selected_reagent)
                 mw = reagent["mw"] if reagent else 100.0
                 purity = reagent["purity"] if reagent else 100.0
                 st.info(f"**MW:** {mw} g/mol | **Purity:** {purity}%")
@@ -452,23 +531,13 @@ def render_calculators():
                 with vol_unit_col:
                     vol_unit = st.selectbox("Unit", ["L", "mL", "µL"], key="mol_vol_unit")
                 
-                # Map units
-                conc_map = {"M": ConcentrationUnit.MOLAR, "mM": ConcentrationUnit.MILLIMOLAR, 
-                           "µM": ConcentrationUnit.MICROMOLAR, "nM": ConcentrationUnit.NANOMOLAR}
-                vol_map = {"L": VolumeUnit.LITERS, "mL": VolumeUnit.MILLILITERS, "µL": VolumeUnit.MICROLITERS}
-                
                 if st.button("Calculate Mass", use_container_width=True, key="calc_mass_btn"):
                     mass_g, formatted = calculate_mass(
                         molarity, volume, mw, purity,
-                        volume_unit=vol_map[vol_unit],
-                        conc_unit=conc_map[conc_unit]
+                        volume_unit=vol_unit,
+                        conc_unit=conc_unit
                     )
-                    st.markdown(f"""
-                    <div class="result-card">
-                        <div class="result-value">{formatted}</div>
-                        <div class="result-label">Mass of {selected_reagent} needed</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(_CARD_TMPL(value=formatted, label=f"Mass of {selected_reagent} needed"), unsafe_allow_html=True)
             
             else:  # Solve for Molarity
                 mass_col, mass_unit_col = st.columns([3, 1])
@@ -483,22 +552,13 @@ def render_calculators():
                 with vol_unit_col:
                     vol_unit = st.selectbox("Unit", ["L", "mL", "µL"], key="mol_vol_unit2")
                 
-                # Map units
-                mass_map = {"g": MassUnit.GRAMS, "mg": MassUnit.MILLIGRAMS, "µg": MassUnit.MICROGRAMS}
-                vol_map = {"L": VolumeUnit.LITERS, "mL": VolumeUnit.MILLILITERS, "µL": VolumeUnit.MICROLITERS}
-                
                 if st.button("Calculate Molarity", use_container_width=True, key="calc_mol_btn"):
                     mol_M, formatted = calculate_molarity(
                         mass, volume, mw, purity,
-                        mass_unit=mass_map[mass_unit],
-                        volume_unit=vol_map[vol_unit]
+                        mass_unit=mass_unit,
+                        volume_unit=vol_unit
                     )
-                    st.markdown(f"""
-                    <div class="result-card">
-                        <div class="result-value">{formatted}</div>
-                        <div class="result-label">Resulting concentration</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(_CARD_TMPL(value=formatted, label="Resulting concentration"), unsafe_allow_html=True)
     
     # --- Dilution Calculator Tab ---
     with tabs[1]:
@@ -531,32 +591,19 @@ def render_calculators():
             with v2_unit_col:
                 v2_unit = st.selectbox("Unit", ["L", "mL", "µL"], key="dil_v2_unit")
         
-        conc_map = {"M": ConcentrationUnit.MOLAR, "mM": ConcentrationUnit.MILLIMOLAR, "µM": ConcentrationUnit.MICROMOLAR}
-        vol_map = {"L": VolumeUnit.LITERS, "mL": VolumeUnit.MILLILITERS, "µL": VolumeUnit.MICROLITERS}
-        
         if st.button("Calculate Dilution", use_container_width=True, key="calc_dil_btn"):
             v1_L, v1_fmt, diluent_L, diluent_fmt = calculate_stock_volume(
                 c1, c2, v2,
-                c1_unit=conc_map[c1_unit],
-                c2_unit=conc_map[c2_unit],
-                v2_unit=vol_map[v2_unit]
+                c1_unit=c1_unit,
+                c2_unit=c2_unit,
+                v2_unit=v2_unit
             )
             
             res_col1, res_col2 = st.columns(2)
             with res_col1:
-                st.markdown(f"""
-                <div class="result-card">
-                    <div class="result-value">{v1_fmt}</div>
-                    <div class="result-label">Stock Solution (V₁)</div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_CARD_TMPL(value=v1_fmt, label="Stock Solution (V₁)"), unsafe_allow_html=True)
             with res_col2:
-                st.markdown(f"""
-                <div class="result-card">
-                    <div class="result-value">{diluent_fmt}</div>
-                    <div class="result-label">Diluent to Add</div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_CARD_TMPL(value=diluent_fmt, label="Diluent to Add"), unsafe_allow_html=True)
             
             # Instructions
             st.markdown(f"""
@@ -586,23 +633,28 @@ def render_calculators():
             num_dilutions = st.number_input("Number of Dilutions", min_value=1, max_value=20, value=6, step=1)
         
         if st.button("Generate Series", use_container_width=True, key="calc_serial_btn"):
-            unit_map = {"M": ConcentrationUnit.MOLAR, "mM": ConcentrationUnit.MILLIMOLAR, 
-                       "µM": ConcentrationUnit.MICROMOLAR, "nM": ConcentrationUnit.NANOMOLAR}
-            
-            series = calculate_serial_dilution(initial_conc, dilution_factor, num_dilutions, unit_map[initial_unit])
+            series = calculate_serial_dilution(initial_conc, dilution_factor, num_dilutions, initial_unit)
             
             st.markdown("#### Dilution Series")
             
-            # Display as a nice table
-            table_data = []
-            for step, conc, formatted in series:
-                table_data.append({
-                    "Step": step,
-                    f"Concentration ({initial_unit})": f"{conc:.4g}",
-                    "Formatted": formatted
-                })
+            # Display as a nice table (columnar, so Streamlit can hand it to Arrow directly)
+            import pandas as pd
+            steps, concs, formatted = zip(*series)
+            table_df = pd.DataFrame({
+                "Step": np.asarray(steps, dtype=np.int32),
+                f"Concentration ({initial_unit})": np.asarray(concs, dtype=np.float64),
+                "Formatted": list(formatted)
+            })
             
-            st.dataframe(table_data, use_container_width=True, hide_index=True)
+            st.dataframe(
+                table_df,
+                use_container_width=True,
+                hide_index=True,
+                # Keep 4 significant figures; the default format rounds dilute steps away
+                column_config={
+                    f"Concentration ({initial_unit})": st.column_config.NumberColumn(format="%.4g")
+                }
+            )
     
     # --- Percent Solution Tab ---
     with tabs[3]:
@@ -625,18 +677,10 @@ def render_calculators():
             with vol_unit_col:
                 pct_vol_unit = st.selectbox("Unit", ["mL", "L"], key="pct_vol_unit")
         
-        mass_map = {"g": MassUnit.GRAMS, "mg": MassUnit.MILLIGRAMS}
-        vol_map = {"mL": VolumeUnit.MILLILITERS, "L": VolumeUnit.LITERS}
-        
         if st.button("Calculate % w/v", use_container_width=True, key="calc_pct_btn"):
-            percent = calculate_percent_solution(pct_mass, pct_vol, mass_map[pct_mass_unit], vol_map[pct_vol_unit])
+            percent = calculate_percent_solution(pct_mass, pct_vol, pct_mass_unit, pct_vol_unit)
             
-            st.markdown(f"""
-            <div class="result-card">
-                <div class="result-value">{percent:.3f}% w/v</div>
-                <div class="result-label">Percent Weight/Volume Solution</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_CARD_TMPL(value=f"{percent:.3f}% w/v", label="Percent Weight/Volume Solution"), unsafe_allow_html=True)
 
     # --- Bottle Molarity Tab ---
     with tabs[4]:
@@ -712,12 +756,7 @@ def render_calculators():
                 if res["defaults_used"]:
                     st.warning("⚠️ **Warning:** Density or Purity not specified. Assuming **1.0 g/mL** and **100% Purity**.")
                 
-                st.markdown(f"""
-                <div class="result-card">
-                    <div class="result-value">{res['fmt']}</div>
-                    <div class="result-label">Stock Molarity</div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(_CARD_TMPL(value=res["fmt"], label="Stock Molarity"), unsafe_allow_html=True)
                 
                 # Bonus: Moles in specific volume
                 st.markdown("---")
@@ -730,20 +769,34 @@ def render_calculators():
 
 
 # --- Protocol Designer Page ---
+@st.cache_data(max_entries=16, show_spinner=False)
+def _protocol_pdf(protocol_name, final_volume, volume_unit, steps_json, hazards_json):
+    """Render the protocol PDF. Steps and hazards arrive JSON-encoded so the cache key hashes cheaply."""
+    from pdf_generator import create_protocol_pdf
+    return create_protocol_pdf(
+        protocol_name,
+        final_volume,
+        volume_unit,
+        _loads_json(steps_json),
+        _loads_json(hazards_json)
+    )
+
+
 def render_protocol_designer():
     """Render the protocol designer page."""
     st.markdown("# 📋 Protocol Designer")
     st.markdown("Build step-by-step recipes for your experiments with automatic scaling.")
     
-    reagents = load_reagents()
-    reagent_names = [r["name"] for r in reagents]
+    reagent_db = _reagents()
+    reagent_meta = reagent_db["meta"]
+    reagent_names = [r["name"] for r in reagent_db["reagents"]]
     
     # --- 1. Recipe Manager (Enhanced) ---
     with st.expander("📂 Recipe Manager (Common & Personal)"):
         rm_tabs = st.tabs(["🧙‍♂️ Common Recipes", "👤 My Recipes"])
         
         # Shared Logic for Load & Scale
-        def load_and_scale_recipe(recipe_steps, recipe_name, target_vol, target_unit):
+        def load_and_scale_recipe(recipe_cols, recipe_name, target_vol, target_unit):
             # Convert target volume to Liters for scaling
             target_vol_L = target_vol
             if target_unit == "mL":
@@ -751,27 +804,16 @@ def render_protocol_designer():
             elif target_unit == "µL":
                 target_vol_L /= 1e6
                 
-            new_steps = []
-            for i, item in enumerate(recipe_steps):
-                # Calculate absolute amount for target volume
-                scaled_amount = item["amount_per_L"] * target_vol_L
-                
-                # Smart Unit Converter for Display
-                display_unit = item["unit"]
-                display_amount = scaled_amount
-                
-                # Simple logic to keep numbers readable
-                # (You could expand this with a proper formatting function if desired)
-                
-                new_steps.append({
-                    "step_number": i + 1,
-                    "reagent": item["reagent"],
-                    "amount": float(f"{display_amount:.4g}"),
-                    "unit": display_unit,
-                    "notes": f"Standard {recipe_name}"
-                })
+            # Calculate absolute amounts for target volume in one pass
+            scaled = recipe_cols["amounts_per_L"] * target_vol_L
             
-            st.session_state.protocol_steps = new_steps
+            # Round to 4 significant figures to keep numbers readable
+            st.session_state.protocol_steps = ProtocolSteps(
+                reagents=list(recipe_cols["reagents"]),
+                amounts=np.array([float(_FMT_4G(amount)) for amount in scaled], dtype=np.float64),
+                units=list(recipe_cols["units"]),
+                notes=[f"Standard {recipe_name}"] * len(scaled)
+            )
             st.session_state.prot_name = f"{recipe_name} ({target_vol} {target_unit})"
             st.session_state.protocol_total_volume = target_vol
             st.session_state.protocol_volume_unit = target_unit
@@ -788,15 +830,14 @@ def render_protocol_designer():
             c_target_unit = c_col2.selectbox("Unit", ["mL", "L", "µL"], index=0, key="c_unit")
             
             if c_recipe_name != "Select..." and st.button("Load Common Recipe"):
-                load_and_scale_recipe(COMMON_RECIPES[c_recipe_name], c_recipe_name, c_target_vol, c_target_unit)
+                load_and_scale_recipe(_COMMON_RECIPES_SOA[c_recipe_name], c_recipe_name, c_target_vol, c_target_unit)
 
         # Tab 2: My Recipes
         with rm_tabs[1]:
-            user_recipes = load_user_recipes()
-            if not user_recipes:
+            u_recipe_names = load_user_recipe_names()
+            if not u_recipe_names:
                 st.warning("No saved recipes yet. Build a protocol and click 'Save to My Recipes' below!")
             else:
-                u_recipe_names = [r["name"] for r in user_recipes]
                 u_recipe_name = st.selectbox("Choose Your Recipe", ["Select..."] + u_recipe_names, key="u_recipe_sel")
                 
                 u_col1, u_col2 = st.columns(2)
@@ -804,20 +845,20 @@ def render_protocol_designer():
                 u_target_unit = u_col2.selectbox("Unit", ["mL", "L", "µL"], index=0, key="u_unit")
                 
                 if u_recipe_name != "Select..." and st.button("Load My Recipe"):
-                    selected_r = next(r for r in user_recipes if r["name"] == u_recipe_name)
-                    load_and_scale_recipe(selected_r["steps"], u_recipe_name, u_target_vol, u_target_unit)
+                    u_steps = load_user_recipe(u_recipe_name)
+                    if u_steps is None:
+                        st.error(f"Recipe '{u_recipe_name}' no longer exists.")
+                    else:
+                        load_and_scale_recipe(_recipe_columns(u_steps), u_recipe_name, u_target_vol, u_target_unit)
 
 
     # --- 2. Safety Dashboard ---
     st.markdown("### 🛡️ Safety Dashboard")
-    current_hazards = set()
-    for step in st.session_state.protocol_steps:
-        # Find reagent in DB
-        r_data = next((r for r in reagents if r["name"] == step["reagent"]), None)
-        if r_data:
-            h = r_data.get("hazard", "None")
-            if h != "None":
-                current_hazards.add(h)
+    current_hazards = frozenset(
+        meta[0]
+        for name in st.session_state.protocol_steps.reagents
+        if (meta := reagent_meta.get(name)) and meta[0] != "None"
+    )
     
     if current_hazards:
         st.warning(f"⚠️ **Caution: This protocol involves: {', '.join(current_hazards)}**")
@@ -850,8 +891,8 @@ def render_protocol_designer():
         vol_unit = st.selectbox("Volume Unit", vol_units, index=unit_index, key="prot_vol_unit")
         st.session_state.protocol_volume_unit = vol_unit
     
-    # Auto-scale if volume changed
-    if new_volume != old_volume and old_volume > 0:
+    # Auto-scale if volume changed (relative tolerance ignores float noise from the stepper)
+    if old_volume > 0 and abs(new_volume - old_volume) > 1e-9 * max(abs(old_volume), 1.0):
         st.session_state.protocol_steps = scale_recipe(
             st.session_state.protocol_steps, 
             new_volume, 
@@ -891,11 +932,6 @@ def render_protocol_designer():
         
         # Calculate Volume
         try:
-            # Re-map units locally for safety
-            c_map = {"M": ConcentrationUnit.MOLAR, "mM": ConcentrationUnit.MILLIMOLAR, 
-                    "µM": ConcentrationUnit.MICROMOLAR, "nM": ConcentrationUnit.NANOMOLAR}
-            v_map = {"L": VolumeUnit.LITERS, "mL": VolumeUnit.MILLILITERS, "µL": VolumeUnit.MICROLITERS}
-            
             # Get Protocol Volume in Liters
             prot_vol = st.session_state.protocol_total_volume
             prot_unit = st.session_state.protocol_volume_unit
@@ -903,24 +939,16 @@ def render_protocol_designer():
             # Use calculate_stock_volume to get V1 in Liters
             v1_L, _, _, _ = calculate_stock_volume(
                 c1, c2, prot_vol,
-                c1_unit=c_map[c1_unit],
-                c2_unit=c_map[c2_unit],
-                v2_unit=v_map[prot_unit]
+                c1_unit=c1_unit,
+                c2_unit=c2_unit,
+                v2_unit=prot_unit
             )
             
             # Determine best unit for display
-            if v1_L < 1e-4: # < 0.1 mL -> use µL
-                final_amount = v1_L * 1e6
-                final_unit = "µL"
-            elif v1_L < 1: # < 1 L -> use mL
-                final_amount = v1_L * 1e3
-                final_unit = "mL"
-            else:
-                final_amount = v1_L
-                final_unit = "L"
+            final_amount, final_unit = best_volume_unit(v1_L)
             
             # Round for cleanliness
-            final_amount = float(f"{final_amount:.4g}")
+            final_amount = float(_FMT_4G(final_amount))
             
             st.caption(f"**Add:** {final_amount} {final_unit}")
             auto_notes = f" (From {c1} {c1_unit} stock → {c2} {c2_unit})"
@@ -942,14 +970,7 @@ def render_protocol_designer():
     
     if st.button("➕ Add Step", use_container_width=True, key="add_step_btn"):
         if new_reagent != "Select...":
-            step = {
-                "step_number": len(st.session_state.protocol_steps) + 1,
-                "reagent": new_reagent,
-                "amount": final_amount,
-                "unit": final_unit,
-                "notes": final_notes
-            }
-            st.session_state.protocol_steps.append(step)
+            st.session_state.protocol_steps.append(new_reagent, final_amount, final_unit, final_notes)
             st.rerun()
         else:
             st.warning("Please select a reagent!")
@@ -958,11 +979,12 @@ def render_protocol_designer():
     
     # Display current steps
     st.markdown("### Recipe Steps")
+    protocol_rows = st.session_state.protocol_steps.to_dicts()
     
-    if not st.session_state.protocol_steps:
+    if not protocol_rows:
         st.info("No steps added yet. Add your first step above!")
     else:
-        for i, step in enumerate(st.session_state.protocol_steps):
+        for i, step in enumerate(protocol_rows):
             with st.container():
                 col1, col2, col3, col4 = st.columns([0.5, 3, 2, 1])
                 
@@ -981,38 +1003,44 @@ def render_protocol_designer():
                 with col4:
                     if st.button("🗑️", key=f"del_step_{i}"):
                         st.session_state.protocol_steps.pop(i)
-                        # Renumber steps
-                        for j, s in enumerate(st.session_state.protocol_steps):
-                            s["step_number"] = j + 1
                         st.rerun()
             
             st.markdown("---")
     
     # Export options
-    if st.session_state.protocol_steps:
+    if protocol_rows:
         st.markdown("### Export Protocol")
         col1, col2 = st.columns(2)
         
         with col1:
             if st.button("📋 Copy as Text", use_container_width=True):
-                text = f"# {protocol_name}\n"
-                text += f"Final Volume: {new_volume} {vol_unit}\n\n"
-                for step in st.session_state.protocol_steps:
-                    text += f"{step['step_number']}. {step['reagent']}: {step['amount']:.2f} {step['unit']}"
-                    if step.get('notes'):
-                        text += f" - {step['notes']}"
-                    text += "\n"
-                st.code(text)
+                parts = [f"# {protocol_name}", f"Final Volume: {new_volume} {vol_unit}", ""]
+                parts.extend(
+                    f"{i}. {step['reagent']}: {step['amount']:.2f} {step['unit']}"
+                    + (f" - {step['notes']}" if step.get('notes') else "")
+                    for i, step in enumerate(protocol_rows, 1)
+                )
+                st.code("\n".join(parts))
         
         with col2:
+            export_data = {
+                "protocol_name": protocol_name,
+                "final_volume": new_volume,
+                "volume_unit": vol_unit,
+                # step_number is part of the exported schema; derived from position
+                "steps": [{"step_number": i, **row} for i, row in enumerate(protocol_rows, 1)]
+            }
             if st.button("💾 Export JSON", use_container_width=True):
-                export_data = {
-                    "protocol_name": protocol_name,
-                    "final_volume": new_volume,
-                    "volume_unit": vol_unit,
-                    "steps": st.session_state.protocol_steps
-                }
                 st.json(export_data)
+            
+            # Encoded only when the button is clicked
+            st.download_button(
+                label="⬇️ Download JSON",
+                data=lambda: _dumps_json(export_data, pretty=True),
+                file_name=f"{protocol_name.replace(' ', '_')}.json",
+                mime="application/json",
+                use_container_width=True
+            )
 
             if st.button("💾 Save to My Recipes", use_container_width=True):
                 # Calculate base volume in Liters for normalization
@@ -1020,7 +1048,7 @@ def render_protocol_designer():
                 if vol_unit == "mL": base_vol_L /= 1000.0
                 elif vol_unit == "µL": base_vol_L /= 1e6
                 
-                success, msg = save_user_recipe_to_file(protocol_name, st.session_state.protocol_steps, base_vol_L)
+                success, msg = save_user_recipe_to_file(protocol_name, protocol_rows, base_vol_L)
                 if success:
                     st.success(msg)
                 else:
@@ -1029,12 +1057,13 @@ def render_protocol_designer():
         # --- 3. PDF Export ---
         with col2:
             try:
-                pdf_bytes = create_protocol_pdf(
+                # Only re-rendered when the protocol itself changes
+                pdf_bytes = _protocol_pdf(
                     protocol_name, 
                     new_volume, 
                     vol_unit, 
-                    st.session_state.protocol_steps, 
-                    list(current_hazards)
+                    _dumps_json(protocol_rows),  # to_dicts() keys are in a fixed order
+                    _dumps_json(sorted(current_hazards))
                 )
                 st.download_button(
                     label="📄 Download PDF",
@@ -1048,12 +1077,80 @@ def render_protocol_designer():
 
 
 # --- Reagent Database Page ---
+# Reagent cards rendered per page; each card is several Streamlit elements
+_REAGENTS_PER_PAGE = 50
+
+
+@st.fragment
+def _reagent_search(reagent_db):
+    """Search box, category filter and reagent cards. Runs as a fragment so typing a query only reruns this block."""
+    reagents = reagent_db["reagents"]
+    reagent_meta = reagent_db["meta"]
+    
+    # Search/filter. text_input only sends its value on Enter or blur (not per
+    # keystroke), and this fragment reruns alone, so no extra debounce is needed.
+    search = st.text_input("🔍 Search reagents...", key="reagent_search")
+    
+    names_lc, formulas_lc, reagent_cats, categories = reagent_db["search_index"]
+    
+    # Filter by category
+    selected_category = st.multiselect("Filter by Category", categories, default=categories)
+    
+    # Filter reagents against the precomputed lowercase columns
+    if search:
+        search_lc = search.lower()
+        candidates = [i for i in range(len(reagents))
+                      if search_lc in names_lc[i] or search_lc in formulas_lc[i]]
+    else:
+        candidates = range(len(reagents))  # Empty search matches everything
+    selected_set = frozenset(selected_category)
+    filtered = [reagents[i] for i in candidates
+                if not selected_set or reagent_cats[i] in selected_set]
+    
+    # Display as cards, one page at a time
+    if not filtered:
+        st.info("No reagents found matching your criteria.")
+    else:
+        n_pages = -(-len(filtered) // _REAGENTS_PER_PAGE)
+        page = 1
+        if n_pages > 1:
+            # A narrower filter can leave the remembered page out of range
+            if st.session_state.get("reagent_page", 1) > n_pages:
+                st.session_state.reagent_page = n_pages
+            page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key="reagent_page")
+        start = (page - 1) * _REAGENTS_PER_PAGE
+        page_reagents = filtered[start:start + _REAGENTS_PER_PAGE]
+        if n_pages > 1:
+            st.caption(f"Showing {start + 1}–{start + len(page_reagents)} of {len(filtered)} reagents")
+        
+        for reagent in page_reagents:
+            with st.container():
+                col1, col2, col3, col4 = st.columns([3, 1.5, 1.5, 1.5])
+            
+                with col1:
+                    st.markdown(f"**{reagent['name']}**")
+                    st.caption(f"Formula: {reagent.get('formula', 'N/A')}")
+            
+                with col2:
+                    st.metric("MW", f"{reagent['mw']} g/mol")
+            
+                with col3:
+                    st.metric("Purity", f"{reagent['purity']}%")
+            
+                with col4:
+                    hazard, storage, hazard_class = reagent_meta[reagent["name"]]
+                    st.markdown(f"<span class='{hazard_class}'>{hazard}</span>", unsafe_allow_html=True)
+                    st.caption(f"Store: {storage}")
+            
+                st.markdown("---")
+
+
 def render_reagent_database():
     """Render the reagent database page."""
     st.markdown("# 📚 Reagent Database")
     st.markdown("Browse and search the reagent database.")
     
-    reagents = load_reagents()
+    reagent_db = _reagents()
     
     # --- Add New Reagent Section ---
     with st.expander("➕ Add New Reagent"):
@@ -1094,43 +1191,7 @@ def render_reagent_database():
     
     st.markdown("---")
     
-    # Search/filter
-    search = st.text_input("🔍 Search reagents...", key="reagent_search")
-    
-    # Filter by category
-    categories = list(set(r.get("category", "Other") for r in reagents))
-    selected_category = st.multiselect("Filter by Category", categories, default=categories)
-    
-    # Filter reagents
-    filtered = [r for r in reagents 
-                if (search.lower() in r["name"].lower() or search.lower() in r.get("formula", "").lower())
-                and (not selected_category or r.get("category", "Other") in selected_category)]
-    
-    # Display as cards
-    if not filtered:
-        st.info("No reagents found matching your criteria.")
-    else:
-        for reagent in filtered:
-            with st.container():
-                col1, col2, col3, col4 = st.columns([3, 1.5, 1.5, 1.5])
-                
-                with col1:
-                    st.markdown(f"**{reagent['name']}**")
-                    st.caption(f"Formula: {reagent.get('formula', 'N/A')}")
-                
-                with col2:
-                    st.metric("MW", f"{reagent['mw']} g/mol")
-                
-                with col3:
-                    st.metric("Purity", f"{reagent['purity']}%")
-                
-                with col4:
-                    hazard = reagent.get("hazard", "None")
-                    hazard_class = f"hazard-{hazard.lower()}" if hazard in ["None", "Irritant", "Flammable"] else "hazard-none"
-                    st.markdown(f"<span class='{hazard_class}'>{hazard}</span>", unsafe_allow_html=True)
-                    st.caption(f"Store: {reagent.get('storage', 'N/A')}")
-                
-                st.markdown("---")
+    _reagent_search(reagent_db)
 
 
 # --- Plate Designer Page ---
@@ -1246,6 +1307,7 @@ def render_plate_designer():
         st.markdown("**Export PDF**")
         if st.button("Generate Plate PDF"):
             try:
+                from pdf_generator import create_plate_pdf
                 pdf_bytes = create_plate_pdf(map_name, st.session_state.plate_grid)
                 st.download_button(
                     label="⬇️ Download PDF",
@@ -1258,6 +1320,67 @@ def render_plate_designer():
 
 
 # --- Unit Converter Page ---
+def _metric_row(base_value, outputs, fmt):
+    """Show base_value converted to every output unit, one metric per column."""
+    labels, factors = outputs
+    values = (base_value * factors).tolist()
+    for col, label, value in zip(st.columns(len(labels)), labels, values):
+        col.metric(label, fmt.format(value))
+
+
+# Each converter tab is a fragment: changing its inputs reruns only that tab, not the page.
+@st.fragment
+def _mass_tab():
+    """Mass converter tab."""
+    st.markdown("### Mass Converter")
+    input_mass = st.number_input("Enter Mass", min_value=0.0, value=1.0, step=0.1, key="conv_mass")
+    input_unit = st.selectbox("From", ["g", "mg", "µg", "kg"], key="conv_mass_unit")
+    
+    # Convert to grams first
+    mass_g = input_mass * MASS_TO_GRAMS[input_unit]
+    
+    _metric_row(mass_g, _MASS_OUTPUTS, "{:.6g}")
+
+
+@st.fragment
+def _volume_tab():
+    """Volume converter tab."""
+    st.markdown("### Volume Converter")
+    input_vol = st.number_input("Enter Volume", min_value=0.0, value=1.0, step=0.1, key="conv_vol")
+    input_unit = st.selectbox("From", ["L", "mL", "µL"], key="conv_vol_unit")
+    
+    vol_L = input_vol * VOLUME_TO_LITERS[input_unit]
+    
+    _metric_row(vol_L, _VOLUME_OUTPUTS, "{:.6g}")
+
+
+@st.fragment
+def _concentration_tab():
+    """Molar concentration converter tab."""
+    st.markdown("### Molar Concentration")
+    input_conc = st.number_input("Enter Concentration", min_value=0.0, value=1.0, step=0.1, key="conv_conc")
+    input_unit = st.selectbox("From", ["M", "mM", "µM", "nM"], key="conv_conc_unit")
+    
+    conc_M = input_conc * CONC_TO_MOLAR[input_unit]
+    
+    _metric_row(conc_M, _CONC_OUTPUTS, "{:.9g}")
+
+
+@st.fragment
+def _mass_volume_tab():
+    """Mass/volume concentration converter tab."""
+    st.markdown("### Mass/Volume Concentration")
+    st.markdown("Convert between density-like concentrations (e.g. g/mL, mg/dL).")
+    
+    mv_val = st.number_input("Enter Value", min_value=0.0, value=1.0, step=0.1, key="conv_mv")
+    mv_unit = st.selectbox("From", ["g/mL", "g/L", "mg/mL", "µg/mL", "mg/dL"], key="conv_mv_unit")
+    
+    # Base unit: g/L
+    val_gL = mv_val * MASS_VOLUME_TO_G_PER_L[mv_unit]
+    
+    _metric_row(val_gL, _MASS_VOLUME_OUTPUTS, "{:.9g}")
+
+
 def render_unit_converter():
     """Render the unit converter page."""
     st.markdown("# 📊 Unit Converter")
@@ -1265,75 +1388,16 @@ def render_unit_converter():
     tabs = st.tabs(["Mass", "Volume", "Concentration (Molar)", "Conc (Mass/Vol)"])
     
     with tabs[0]:
-        st.markdown("### Mass Converter")
-        input_mass = st.number_input("Enter Mass", min_value=0.0, value=1.0, step=0.1, key="conv_mass")
-        input_unit = st.selectbox("From", ["g", "mg", "µg", "kg"], key="conv_mass_unit")
-        
-        # Convert to grams first
-        mass_factors = {"kg": 1000, "g": 1, "mg": 0.001, "µg": 0.000001}
-        mass_g = input_mass * mass_factors[input_unit]
-        
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("kg", f"{mass_g / 1000:.6g}")
-        col2.metric("g", f"{mass_g:.6g}")
-        col3.metric("mg", f"{mass_g * 1000:.6g}")
-        col4.metric("µg", f"{mass_g * 1000000:.6g}")
+        _mass_tab()
     
     with tabs[1]:
-        st.markdown("### Volume Converter")
-        input_vol = st.number_input("Enter Volume", min_value=0.0, value=1.0, step=0.1, key="conv_vol")
-        input_unit = st.selectbox("From", ["L", "mL", "µL"], key="conv_vol_unit")
-        
-        vol_factors = {"L": 1, "mL": 0.001, "µL": 0.000001}
-        vol_L = input_vol * vol_factors[input_unit]
-        
-        col1, col2, col3 = st.columns(3)
-        col1.metric("L", f"{vol_L:.6g}")
-        col2.metric("mL", f"{vol_L * 1000:.6g}")
-        col3.metric("µL", f"{vol_L * 1000000:.6g}")
+        _volume_tab()
     
     with tabs[2]:
-        st.markdown("### Molar Concentration")
-        input_conc = st.number_input("Enter Concentration", min_value=0.0, value=1.0, step=0.1, key="conv_conc")
-        input_unit = st.selectbox("From", ["M", "mM", "µM", "nM"], key="conv_conc_unit")
-        
-        conc_factors = {"M": 1, "mM": 0.001, "µM": 0.000001, "nM": 0.000000001}
-        conc_M = input_conc * conc_factors[input_unit]
-        
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("M", f"{conc_M:.9g}")
-        col2.metric("mM", f"{conc_M * 1000:.9g}")
-        col3.metric("µM", f"{conc_M * 1000000:.9g}")
-        col4.metric("nM", f"{conc_M * 1000000000:.9g}")
-
+        _concentration_tab()
+    
     with tabs[3]:
-        st.markdown("### Mass/Volume Concentration")
-        st.markdown("Convert between density-like concentrations (e.g. g/mL, mg/dL).")
-        
-        mv_val = st.number_input("Enter Value", min_value=0.0, value=1.0, step=0.1, key="conv_mv")
-        mv_unit = st.selectbox("From", ["g/mL", "g/L", "mg/mL", "µg/mL", "mg/dL"], key="conv_mv_unit")
-        
-        # Base unit: g/L
-        # g/mL = 1000 g/L
-        # mg/mL = 1 g/L
-        # µg/mL = 0.001 g/L
-        # mg/dL = 0.01 g/L (1 mg / 100 mL = 0.001g / 0.1L = 0.01 g/L)
-        
-        mv_factors = {
-            "g/mL": 1000.0,
-            "g/L": 1.0,
-            "mg/mL": 1.0,
-            "µg/mL": 0.001,
-            "mg/dL": 0.01
-        }
-        
-        val_gL = mv_val * mv_factors[mv_unit]
-        
-        c1, c2, c3, c4 = st.columns(4)
-        c1.metric("g/mL", f"{val_gL / 1000.0:.9g}")
-        c2.metric("g/L (mg/mL)", f"{val_gL:.9g}")
-        c3.metric("µg/mL", f"{val_gL * 1000.0:.9g}")
-        c4.metric("mg/dL", f"{val_gL * 100.0:.9g}")
+        _mass_volume_tab()
 
     # --- Bottle Molarity Tab (Injecting into calculators, not unit converter) ---
     # Wait, the above context is Unit Converter. I need to be in render_calculators tabs[4].
@@ -3,9 +3,12 @@ Laboratory Calculations Module
 Provides functions for common lab calculations: molarity, dilution, unit conversions, and recipe scaling.
 """
 
-from typing import Tuple, List, Dict, Any
-from dataclasses import dataclass
+from typing import Tuple, List, Dict, Any, Union
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
+
+import numpy as np
 
 # --- Unit Conversion Constants ---
 class MassUnit(Enum):
@@ -27,27 +30,38 @@ class ConcentrationUnit(Enum):
     PERCENT_WV = "% w/v"
     PERCENT_VV = "% v/v"
 
-# Conversion factors to base units (g, L, M)
+# Conversion factors to base units (g, L, M), keyed by unit symbol
+# (the Enum values above, e.g. MassUnit.MILLIGRAMS.value == "mg")
 MASS_TO_GRAMS = {
-    MassUnit.KILOGRAMS: 1000,
-    MassUnit.GRAMS: 1,
-    MassUnit.MILLIGRAMS: 0.001,
-    MassUnit.MICROGRAMS: 0.000001,
+    "kg": 1000.0,
+    "g": 1.0,
+    "mg": 0.001,
+    "µg": 0.000001,
 }
 
 VOLUME_TO_LITERS = {
-    VolumeUnit.LITERS: 1,
-    VolumeUnit.MILLILITERS: 0.001,
-    VolumeUnit.MICROLITERS: 0.000001,
+    "L": 1.0,
+    "mL": 0.001,
+    "µL": 0.000001,
 }
 
 CONC_TO_MOLAR = {
-    ConcentrationUnit.MOLAR: 1,
-    ConcentrationUnit.MILLIMOLAR: 0.001,
-    ConcentrationUnit.MICROMOLAR: 0.000001,
-    ConcentrationUnit.NANOMOLAR: 0.000000001,
+    "M": 1.0,
+    "mM": 0.001,
+    "µM": 0.000001,
+    "nM": 0.000000001,
 }
 
+
+def _unit_factor(table: Dict[str, float], unit: Union[str, Enum]) -> float:
+    """Look up a base-unit conversion factor. Enum members are accepted for backward compatibility."""
+    if isinstance(unit, Enum):
+        unit = unit.value
+    try:
+        return table[unit]
+    except KeyError:
+        raise ValueError(f"Unsupported unit: {unit}") from None
+
 # --- Core Calculation Functions ---
 
 def calculate_mass(
@@ -55,8 +69,8 @@ def calculate_mass(
     volume: float,
     mw: float,
     purity: float = 100.0,
-    volume_unit: VolumeUnit = VolumeUnit.LITERS,
-    conc_unit: ConcentrationUnit = ConcentrationUnit.MOLAR
+    volume_unit: str = "L",
+    conc_unit: str = "M"
 ) -> Tuple[float, str]:
     """
     Calculate mass of reagent needed.
@@ -65,8 +79,8 @@ def calculate_mass(
     Returns: (mass_in_grams, formatted_string)
     """
     # Convert to base units
-    molarity_M = molarity * CONC_TO_MOLAR.get(conc_unit, 1)
-    volume_L = volume * VOLUME_TO_LITERS.get(volume_unit, 1)
+    molarity_M = molarity * _unit_factor(CONC_TO_MOLAR, conc_unit)
+    volume_L = volume * _unit_factor(VOLUME_TO_LITERS, volume_unit)
     
     # Calculate mass, adjusting for purity
     purity_fraction = purity / 100.0
@@ -80,8 +94,8 @@ def calculate_molarity(
     volume: float,
     mw: float,
     purity: float = 100.0,
-    mass_unit: MassUnit = MassUnit.GRAMS,
-    volume_unit: VolumeUnit = VolumeUnit.LITERS
+    mass_unit: str = "g",
+    volume_unit: str = "L"
 ) -> Tuple[float, str]:
     """
     Calculate molarity from mass of reagent.
@@ -90,8 +104,8 @@ def calculate_molarity(
     Returns: (molarity_in_M, formatted_string)
     """
     # Convert to base units
-    mass_g = mass * MASS_TO_GRAMS.get(mass_unit, 1)
-    volume_L = volume * VOLUME_TO_LITERS.get(volume_unit, 1)
+    mass_g = mass * _unit_factor(MASS_TO_GRAMS, mass_unit)
+    volume_L = volume * _unit_factor(VOLUME_TO_LITERS, volume_unit)
     
     if volume_L == 0 or mw == 0:
         return 0.0, "0 M"
@@ -106,9 +120,9 @@ def calculate_stock_volume(
     c1: float,
     c2: float,
     v2: float,
-    c1_unit: ConcentrationUnit = ConcentrationUnit.MOLAR,
-    c2_unit: ConcentrationUnit = ConcentrationUnit.MOLAR,
-    v2_unit: VolumeUnit = VolumeUnit.LITERS
+    c1_unit: str = "M",
+    c2_unit: str = "M",
+    v2_unit: str = "L"
 ) -> Tuple[float, str, float, str]:
     """
     Calculate volume of stock solution needed for dilution.
@@ -117,9 +131,9 @@ def calculate_stock_volume(
     Returns: (v1_in_liters, formatted_v1, diluent_volume, formatted_diluent)
     """
     # Convert to base units
-    c1_M = c1 * CONC_TO_MOLAR.get(c1_unit, 1)
-    c2_M = c2 * CONC_TO_MOLAR.get(c2_unit, 1)
-    v2_L = v2 * VOLUME_TO_LITERS.get(v2_unit, 1)
+    c1_M = c1 * _unit_factor(CONC_TO_MOLAR, c1_unit)
+    c2_M = c2 * _unit_factor(CONC_TO_MOLAR, c2_unit)
+    v2_L = v2 * _unit_factor(VOLUME_TO_LITERS, v2_unit)
     
     if c1_M == 0:
         return 0.0, "0 L", v2_L, format_volume(v2_L)
@@ -159,15 +173,15 @@ def calculate_stock_molarity(
 def calculate_percent_solution(
     mass: float,
     volume: float,
-    mass_unit: MassUnit = MassUnit.GRAMS,
-    volume_unit: VolumeUnit = VolumeUnit.MILLILITERS
+    mass_unit: str = "g",
+    volume_unit: str = "mL"
 ) -> float:
     """
     Calculate % w/v solution.
     Formula: % w/v = (mass in g / volume in mL) × 100
     """
-    mass_g = mass * MASS_TO_GRAMS.get(mass_unit, 1)
-    volume_mL = volume * VOLUME_TO_LITERS.get(volume_unit, 1) * 1000
+    mass_g = mass * _unit_factor(MASS_TO_GRAMS, mass_unit)
+    volume_mL = volume * _unit_factor(VOLUME_TO_LITERS, volume_unit) * 1000
     
     if volume_mL == 0:
         return 0.0
@@ -179,21 +193,21 @@ def calculate_serial_dilution(
     initial_conc: float,
     dilution_factor: float,
     num_dilutions: int,
-    conc_unit: ConcentrationUnit = ConcentrationUnit.MOLAR
+    conc_unit: str = "M"
 ) -> List[Tuple[int, float, str]]:
     """
     Calculate concentrations for a serial dilution series.
     
     Returns: List of (step_number, concentration, formatted_string)
     """
-    results = []
-    current_conc = initial_conc
+    # Whole series in one call: C_i = C_0 / factor^i
+    concs = initial_conc * np.power(float(dilution_factor), -np.arange(num_dilutions + 1, dtype=np.float64))
+    concs_M = concs * _unit_factor(CONC_TO_MOLAR, conc_unit)
     
-    for i in range(num_dilutions + 1):
-        results.append((i, current_conc, format_concentration(current_conc * CONC_TO_MOLAR.get(conc_unit, 1))))
-        current_conc /= dilution_factor
-    
-    return results
+    return [
+        (i, float(c), format_concentration(float(c_M)))
+        for i, (c, c_M) in enumerate(zip(concs, concs_M))
+    ]
 
 
 # --- Recipe/Protocol Scaling ---
@@ -206,31 +220,87 @@ class RecipeStep:
     amount: float
     amount_unit: str
     notes: str = ""
+
+
+@dataclass
+class ProtocolSteps:
+    """Protocol steps stored column-wise: entry i of each field belongs to step i."""
+    reagents: List[str] = field(default_factory=list)
+    amounts: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    units: List[str] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.reagents)
+    
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare the amounts arrays element-wise and fail
+        if not isinstance(other, ProtocolSteps):
+            return NotImplemented
+        return (
+            self.reagents == other.reagents
+            and np.array_equal(self.amounts, other.amounts)
+            and self.units == other.units
+            and self.notes == other.notes
+        )
     
+    def append(self, reagent: str, amount: float, unit: str, notes: str = "") -> None:
+        """Add a step at the end."""
+        self.reagents.append(reagent)
+        self.amounts = np.append(self.amounts, amount)
+        self.units.append(unit)
+        self.notes.append(notes)
+    
+    def pop(self, index: int) -> None:
+        """Remove the step at index."""
+        del self.reagents[index]
+        self.amounts = np.delete(self.amounts, index)
+        del self.units[index]
+        del self.notes[index]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the steps as a list of dicts, in order; callers number them by position."""
+        return [
+            {"reagent": reagent, "amount": amount, "unit": unit, "notes": notes}
+            for reagent, amount, unit, notes in zip(self.reagents, self.amounts.tolist(), self.units, self.notes)
+        ]
+
+
 def scale_recipe(
-    steps: List[Dict[str, Any]],
+    steps: Union[List[Dict[str, Any]], ProtocolSteps],
     new_total_volume: float,
     old_total_volume: float
-) -> List[Dict[str, Any]]:
+) -> Union[List[Dict[str, Any]], ProtocolSteps]:
     """
     Scale all recipe step amounts proportionally when total volume changes.
     
     Args:
-        steps: List of recipe step dictionaries with 'amount' key
+        steps: List of recipe step dictionaries with 'amount' key, or ProtocolSteps
         new_total_volume: New desired total volume
         old_total_volume: Original total volume
     
-    Returns: New list with scaled amounts
+    Returns: New list (or ProtocolSteps) with scaled amounts
     """
     if old_total_volume == 0:
         return steps
     
     scale_factor = new_total_volume / old_total_volume
-    scaled_steps = []
     
-    for step in steps:
-        new_step = step.copy()
-        new_step['amount'] = round(step['amount'] * scale_factor, 4)
+    if isinstance(steps, ProtocolSteps):
+        return ProtocolSteps(
+            reagents=list(steps.reagents),
+            amounts=np.round(steps.amounts * scale_factor, 4),
+            units=list(steps.units),
+            notes=list(steps.notes),
+        )
+    
+    amounts = np.fromiter((step['amount'] for step in steps), dtype=np.float64, count=len(steps))
+    scaled = np.round(amounts * scale_factor, 4)
+    
+    scaled_steps = []
+    for step, amount in zip(steps, scaled.tolist()):
+        new_step = dict(step)
+        new_step['amount'] = amount
         scaled_steps.append(new_step)
     
     return scaled_steps
@@ -238,6 +308,7 @@ def scale_recipe(
 
 # --- Formatting Helpers ---
 
+@lru_cache(maxsize=2048)
 def format_mass(mass_g: float) -> str:
     """Format mass with appropriate unit based on magnitude."""
     if mass_g >= 1000:
@@ -250,6 +321,7 @@ def format_mass(mass_g: float) -> str:
         return f"{mass_g * 1000000:.3f} µg"
 
 
+@lru_cache(maxsize=2048)
 def format_volume(volume_L: float) -> str:
     """Format volume with appropriate unit based on magnitude."""
     if volume_L >= 1:
@@ -260,6 +332,21 @@ def format_volume(volume_L: float) -> str:
         return f"{volume_L * 1000000:.3f} µL"
 
 
+def best_volume_unit(volume_L: float) -> Tuple[float, str]:
+    """
+    Pick a readable pipetting unit for a volume given in liters.
+    
+    Returns: (amount_in_chosen_unit, unit_symbol)
+    """
+    if volume_L < 1e-4:  # < 0.1 mL -> use µL
+        return volume_L * 1e6, "µL"
+    elif volume_L < 1:  # < 1 L -> use mL
+        return volume_L * 1e3, "mL"
+    else:
+        return volume_L, "L"
+
+
+@lru_cache(maxsize=2048)
 def format_concentration(conc_M: float) -> str:
     """Format concentration with appropriate unit based on magnitude."""
     if conc_M >= 1:
@@ -72,8 +72,8 @@ def create_protocol_pdf(protocol_name, final_volume, volume_unit, steps, hazards
     
     # Steps Content
     pdf.set_font("helvetica", "", 10)
-    for step in steps:
-        pdf.cell(col_widths[0], 8, str(step['step_number']), border=1)
+    for i, step in enumerate(steps, 1):
+        pdf.cell(col_widths[0], 8, str(i), border=1)
         pdf.cell(col_widths[1], 8, step['reagent'], border=1)
         pdf.cell(col_widths[2], 8, f"{step['amount']} {step['unit']}", border=1)
         pdf.cell(col_widths[3], 8, step.get('notes', ''), border=1, new_x="LMARGIN", new_y="NEXT")